@@ -10,6 +10,11 @@ SYSTEM_PROMPT = (
     "Highlight key details like dates or status in **bold**."
 )
 
+# Shared by single and batched explain requests: Ollama reloads the model
+# runner whenever num_ctx changes, so both paths must use the same value.
+EXPLAIN_NUM_CTX = 4096
+
+
 def explain_branch(branch_info: dict) -> str:
     """
     Generate a human-readable explanation for a stale branch using Ollama.
@@ -22,6 +27,7 @@ Last commit date: {branch_info['last_commit_date']}
 Commit count: {branch_info['commit_count']}
 Merged: {branch_info['merged']}
 Upstream status: {branch_info['upstream_status']}
+Stale rule: {branch_info.get('stale_rule', 'unknown')}
 
 Explain why this branch is considered stale.
 """
@@ -39,7 +45,7 @@ Explain why this branch is considered stale.
                 ],
                 "stream": False,
                 "options": {
-                    "num_ctx": 2048,  # Limit context window for speed
+                    "num_ctx": EXPLAIN_NUM_CTX,
                     "temperature": 0.2, # Lower temp for faster deterministic output
                     "num_predict": 150 # Limit output tokens
                 }
@@ -52,6 +58,188 @@ Explain why this branch is considered stale.
         return f"Error calling Ollama: {e}"
 
 
+BATCH_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT + " "
+    "You will receive several branches as a JSON array. "
+    "Reply with a JSON object of the form "
+    '{"branches": [{"branch": "<name>", "explanation": "<markdown>"}]} '
+    "containing exactly one entry per input branch."
+)
+
+BATCH_TOKENS_PER_BRANCH = 150  # Output tokens reserved for each explanation
+BATCH_RESPONSE_OVERHEAD = 16  # Output tokens for the {"branches": [...]} wrapper
+BATCH_TIMEOUT_BASE = 60  # Seconds allowed for prompt evaluation
+BATCH_SECONDS_PER_TOKEN = 0.25  # Generation speed of llama3.2 on a CPU-only host
+CHARS_PER_TOKEN = 4  # Rough estimate used to size batches
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _branch_entry(branch_info: dict) -> dict:
+    return {
+        "branch": branch_info["branch"],
+        "last_commit_message": branch_info["last_commit_message"],
+        "last_commit_date": branch_info["last_commit_date"],
+        "commit_count": branch_info["commit_count"],
+        "merged": branch_info["merged"],
+        "upstream_status": branch_info["upstream_status"],
+        "stale_rule": branch_info.get("stale_rule", "unknown"),
+    }
+
+
+def _serialize_entry(branch_info: dict) -> str:
+    return json.dumps(_branch_entry(branch_info))
+
+
+def _batch_prompt(batch: list) -> str:
+    # One compact entry per line, so the prompt is exactly what pack_batches sized
+    entries = ",\n".join(_serialize_entry(info) for info in batch)
+    return f"Explain why each of these branches is considered stale.\n\n[\n{entries}\n]"
+
+
+def _output_tokens(branch_info: dict) -> int:
+    # The explanation itself, a margin for JSON escaping, and the entry framing
+    framing = json.dumps({"branch": branch_info["branch"], "explanation": ""}) + ","
+    return BATCH_TOKENS_PER_BRANCH * 5 // 4 + _estimate_tokens(framing)
+
+
+def _batch_num_predict(batch: list) -> int:
+    return BATCH_RESPONSE_OVERHEAD + sum(_output_tokens(info) for info in batch)
+
+
+def _batch_timeout(batch: list) -> float:
+    return BATCH_TIMEOUT_BASE + _batch_num_predict(batch) * BATCH_SECONDS_PER_TOKEN
+
+
+def pack_batches(branch_infos: list, num_ctx: int = EXPLAIN_NUM_CTX) -> list:
+    """
+    Split branch metadata into batches that fit the context budget.
+
+    Each branch costs its serialized metadata plus the output tokens reserved
+    for its explanation. A branch that does not fit on its own still gets a
+    batch of one.
+    """
+    budget = (
+        num_ctx
+        - _estimate_tokens(BATCH_SYSTEM_PROMPT)
+        - _estimate_tokens(_batch_prompt([]))
+        - BATCH_RESPONSE_OVERHEAD
+    )
+    batches, current, used = [], [], 0
+
+    for info in branch_infos:
+        cost = _estimate_tokens(_serialize_entry(info) + ",\n") + _output_tokens(info)
+        if current and used + cost > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(info)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(content: str, expected: list) -> dict:
+    """
+    Parse a batched JSON response into a {branch: explanation} mapping.
+
+    Entries for unknown branches, duplicates and empty explanations are
+    dropped so the caller can fall back to per-branch requests for them.
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return {}
+
+    entries = data.get("branches") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+
+    wanted = set(expected)
+    results = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        name = entry.get("branch")
+        explanation = entry.get("explanation")
+        if name not in wanted or name in results:
+            continue
+        if not isinstance(explanation, str) or not explanation.strip():
+            continue
+        results[name] = explanation.strip()
+    return results
+
+
+def _explain_batch(batch: list, split: bool = True) -> dict:
+    """
+    Explain one batch, returning {branch: explanation} for the valid entries.
+
+    A timed-out batch is split in half and each half retried once; a half
+    that times out again is left to the per-branch fallback. If Ollama is
+    unreachable, every branch gets the error message instead of being
+    retried one request at a time.
+    """
+    names = [info["branch"] for info in batch]
+
+    try:
+        response = requests.post(
+            "http://localhost:11434/api/chat",
+            json={
+                "model": "llama3.2",
+                "messages": [
+                    {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": _batch_prompt(batch)},
+                ],
+                "stream": False,
+                "format": "json",
+                "options": {
+                    "num_ctx": EXPLAIN_NUM_CTX,
+                    "temperature": 0.2,
+                    "num_predict": _batch_num_predict(batch)
+                }
+            },
+            timeout=_batch_timeout(batch)
+        )
+        response.raise_for_status()
+        content = response.json()["message"]["content"]
+    except requests.ConnectionError as e:
+        return {name: f"Error calling Ollama: {e}" for name in names}
+    except requests.Timeout:
+        if split and len(batch) > 1:
+            half = len(batch) // 2
+            return {
+                **_explain_batch(batch[:half], split=False),
+                **_explain_batch(batch[half:], split=False),
+            }
+        return {}
+    except Exception:
+        return {}
+
+    return parse_batch_response(content, names)
+
+
+def explain_branches(branch_infos: list) -> dict:
+    """
+    Explain many stale branches with as few Ollama requests as possible.
+
+    Branches are packed into batched prompts that ask for structured JSON.
+    Any branch missing or invalid in the batched reply is explained with a
+    regular `explain_branch` call instead. Returns {branch: explanation}.
+    """
+    results = {}
+
+    for batch in pack_batches(branch_infos):
+        explained = _explain_batch(batch) if len(batch) > 1 else {}
+        for info in batch:
+            name = info["branch"]
+            results[name] = explained.get(name) or explain_branch(info)
+
+    return results
+
+
 def generate_commit_message(diff: str) -> str:
     """
     Generate a conventional commit message based on the provided diff.
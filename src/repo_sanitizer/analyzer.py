@@ -1,7 +1,6 @@
-from concurrent.futures import ThreadPoolExecutor
-
-from repo_sanitizer.git_handler import get_upstream_status
+from repo_sanitizer.git_handler import get_ref_snapshot
 from repo_sanitizer.config import load_config
+from repo_sanitizer.policy import compile_policy
 
 cfg = load_config()
 PROTECTED = set(cfg["protected_branches"])
@@ -18,28 +17,35 @@ def base_branch(repo):
     return None
 
 
-def is_merged(repo, base, branch):
-    merged = repo.git.branch("--merged", base.name)
-    merged = [b.replace("*", "").strip() for b in merged.splitlines()]
-    return branch in merged
+def policy_bases(repo, policy):
+    """Bases for the merged_into rule, defaulting to the first protected branch."""
+    if policy.merged_into is not None:
+        names = {b.name for b in repo.branches}
+        return [b for b in policy.merged_into if b in names]
+    base = base_branch(repo)
+    return [base.name] if base else []
+
+
+def evaluate_branches(repo, branches):
+    """
+    Return {branch: Verdict} for the given branches under the configured policy.
+
+    Raises ValueError if the policy section of the config is invalid, or if
+    min_ahead is set but no protected branch exists to count commits against.
+    """
+    policy = compile_policy(cfg)
+    bases = policy_bases(repo, policy)
+    ahead_base = None
+    if policy.min_ahead is not None:
+        base = base_branch(repo)
+        if base is None:
+            raise ValueError("min_ahead needs one of protected_branches to exist as a base")
+        ahead_base = base.name
+    snapshot = get_ref_snapshot(repo, bases, ahead_base, branches)
+    wanted = {b: snapshot[b] for b in branches if b in snapshot}
+    return policy.evaluate(wanted)
 
 
 def find_stale(repo, branches):
-    base = base_branch(repo)
-    stale = []
-
-    def check(branch):
-        if is_protected(branch):
-            return None
-        if get_upstream_status(repo, branch) == "gone":
-            return branch
-        if base and is_merged(repo, base, branch):
-            return branch
-        return None
-
-    with ThreadPoolExecutor() as ex:
-        for r in ex.map(check, branches):
-            if r:
-                stale.append(r)
-
-    return stale
+    verdicts = evaluate_branches(repo, branches)
+    return [b for b, v in verdicts.items() if v.stale]
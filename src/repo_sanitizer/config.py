@@ -5,7 +5,10 @@ DEFAULT_CONFIG = {
     "protected_branches": ["main", "master", "dev", "develop"],
     "auto_confirm": False,
     "dry_run_default": False,
-    "log_file": "repo-sanitizer.log"
+    "log_file": "repo-sanitizer.log",
+    "policy": {
+        "upstream_gone": True,
+    }
 }
 
 def load_config():
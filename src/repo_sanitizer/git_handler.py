@@ -1,4 +1,4 @@
-from git import Repo, InvalidGitRepositoryError
+from git import Repo, InvalidGitRepositoryError, GitCommandError
 from pathlib import Path
 import typer
 
@@ -29,6 +29,69 @@ def get_upstream_status(repo, branch):
         return "gone"
 
 
+def get_merged_branches(repo, base):
+    """Get the set of local branches merged into base, in one git call."""
+    out = repo.git.for_each_ref("--merged", f"refs/heads/{base}", "--format=%(refname:lstrip=2)", "refs/heads")
+    return set(out.splitlines())
+
+
+def get_ahead_counts(repo, base, branches):
+    """Get how many commits each branch has that base does not."""
+    try:
+        # git >= 2.41 computes this for every ref in a single walk
+        out = repo.git.for_each_ref(f"--format=%(refname:lstrip=2)%09%(ahead-behind:refs/heads/{base})", "refs/heads")
+        counts = {}
+        for line in out.splitlines():
+            name, ahead_behind = line.split("\t")
+            counts[name] = int(ahead_behind.split()[0])
+        return counts
+    except GitCommandError:
+        return {b: int(repo.git.rev_list("--count", f"refs/heads/{base}..refs/heads/{b}")) for b in branches}
+
+
+def get_ref_snapshot(repo, bases=(), ahead_base=None, branches=None):
+    """
+    Collect staleness metadata for all local branches in bulk.
+
+    Returns {branch: {"upstream_gone", "committed", "merged_into", "ahead"}}
+    using one for-each-ref call, plus one per base and one for ahead counts.
+    Ahead counts are only filled in for `branches` (default: all of them);
+    branches merged into `ahead_base` are 0 without asking git.
+    """
+    out = repo.git.for_each_ref(
+        "--format=%(refname:lstrip=2)%09%(upstream:track)%09%(committerdate:unix)",
+        "refs/heads",
+    )
+    snapshot = {}
+    for line in out.splitlines():
+        name, track, committed = line.split("\t")
+        snapshot[name] = {
+            "upstream_gone": track == "[gone]",
+            "committed": int(committed),
+            "merged_into": [],
+            "ahead": None,
+        }
+
+    for base in bases:
+        for name in get_merged_branches(repo, base):
+            if name in snapshot:
+                snapshot[name]["merged_into"].append(base)
+
+    if ahead_base:
+        wanted = [b for b in (snapshot if branches is None else branches) if b in snapshot]
+        if ahead_base in bases:
+            merged = {b for b in wanted if ahead_base in snapshot[b]["merged_into"]}
+        else:
+            merged = get_merged_branches(repo, ahead_base)
+
+        pending = [b for b in wanted if b not in merged]
+        counts = get_ahead_counts(repo, ahead_base, pending) if pending else {}
+        for name in wanted:
+            snapshot[name]["ahead"] = 0 if name in merged else counts.get(name)
+
+    return snapshot
+
+
 def get_branch_metadata(repo, branch_name):
     commit = repo.heads[branch_name].commit
     return {
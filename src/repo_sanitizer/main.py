@@ -7,7 +7,7 @@ from repo_sanitizer.git_handler import (
     fetch_and_prune,
     get_local_branches,
 )
-from repo_sanitizer.analyzer import find_stale
+from repo_sanitizer.analyzer import evaluate_branches
 from repo_sanitizer.ui import select, print_summary
 from repo_sanitizer.logger import log
 from repo_sanitizer.config import load_config
@@ -27,30 +27,43 @@ def clean(
     repo = load_repo()
     fetch_and_prune(repo)
 
-    stale = find_stale(repo, get_local_branches(repo))
+    try:
+        verdicts = evaluate_branches(repo, get_local_branches(repo))
+    except ValueError as e:
+        console.print(f"[red]❌ Invalid .repo-sanitizer.yml: {e}[/red]")
+        raise typer.Exit(1)
+    stale = [b for b, v in verdicts.items() if v.stale]
 
     if not stale:
         console.print("[green]No stale branches found[/green]")
         return
 
     if explain:
-        from repo_sanitizer.ai_explainer import explain_branch
+        from repo_sanitizer.ai_explainer import explain_branches
         from repo_sanitizer.git_handler import get_branch_metadata
 
+        infos = []
         for b in stale:
             try:
                 info = get_branch_metadata(repo, b)
-                info["merged"] = True  # already verified by analyzer
-                explanation = explain_branch(info)
-                console.print(f"\n[bold cyan]🔍 Analysis for {b}:[/bold cyan]")
-                console.print(Markdown(explanation))
-                console.print()
+                info["merged"] = verdicts[b].merged
+                info["stale_rule"] = verdicts[b].rule
+                infos.append(info)
             except Exception as e:
                 console.print(f"[yellow]AI skipped for {b}: {e}[/yellow]")
 
+        with console.status("[bold green]🤖 Explaining stale branches...[/bold green]"):
+            explanations = explain_branches(infos)
+
+        for info in infos:
+            b = info["branch"]
+            console.print(f"\n[bold cyan]🔍 Analysis for {b}:[/bold cyan]")
+            console.print(Markdown(explanations[b]))
+            console.print()
+
     if dry_run or cfg["dry_run_default"]:
         for b in stale:
-            console.print(f"[yellow]DRY RUN → {b}[/yellow]")
+            console.print(f"[yellow]DRY RUN → {b}[/yellow] [dim]({verdicts[b].rule})[/dim]")
         return
 
     selected = stale if all or cfg["auto_confirm"] else select(stale)
@@ -0,0 +1,129 @@
+import re
+import time
+import fnmatch
+from collections import namedtuple
+
+# `merged` is reported independently of which rule matched, since a branch
+# whose upstream is gone is usually merged as well
+Verdict = namedtuple("Verdict", ["stale", "rule", "merged"])
+
+POLICY_KEYS = {
+    "protected_patterns",
+    "merged_into",
+    "upstream_gone",
+    "max_age_days",
+    "min_ahead",
+}
+
+
+class Policy:
+    """
+    Compiled staleness rules, evaluated against a bulk ref snapshot.
+
+    Keep rules win over stale rules:
+      1. branch is one of the base branches -> keep
+      2. branch matches a protected glob pattern -> keep
+      3. branch is at least `min_ahead` commits ahead of the base -> keep
+      4. upstream is gone, branch is merged into another base, or last commit
+         is older than `max_age_days` -> stale
+    """
+
+    def __init__(self, protected_patterns, merged_into=None, upstream_gone=True,
+                 max_age_days=None, min_ahead=None, base_branches=()):
+        self.protected_patterns = list(protected_patterns)
+        self.merged_into = list(merged_into) if merged_into is not None else None
+        self.base_branches = set(base_branches) | set(self.merged_into or ())
+        self.upstream_gone = bool(upstream_gone)
+        self.max_age_days = max_age_days
+        self.min_ahead = min_ahead
+
+        # One regex for all patterns instead of an fnmatch call per pattern
+        self._protected = re.compile(
+            "|".join(fnmatch.translate(p) for p in self.protected_patterns)
+        ) if self.protected_patterns else None
+
+    def protected_pattern(self, branch):
+        if not self._protected or not self._protected.match(branch):
+            return None
+        for p in self.protected_patterns:
+            if fnmatch.fnmatchcase(branch, p):
+                return p
+        return None
+
+    def evaluate(self, snapshot, now=None):
+        """
+        Return {branch: Verdict} for every branch in the snapshot.
+
+        `snapshot` maps branch name to a dict with `upstream_gone`,
+        `committed` (unix timestamp), `merged_into` (list of bases) and
+        `ahead` (commits ahead of the base, or None if not computed).
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.max_age_days * 86400 if self.max_age_days is not None else None
+        verdicts = {}
+
+        for branch, ref in snapshot.items():
+            pattern = self.protected_pattern(branch)
+            merged_into = [b for b in ref["merged_into"] if b != branch]
+            merged = bool(merged_into)
+            if branch in self.base_branches:
+                verdicts[branch] = Verdict(False, "base", merged)
+            elif pattern is not None:
+                verdicts[branch] = Verdict(False, f"protected:{pattern}", merged)
+            elif (self.min_ahead is not None and ref["ahead"] is not None
+                    and ref["ahead"] >= self.min_ahead):
+                verdicts[branch] = Verdict(False, "min_ahead", merged)
+            elif self.upstream_gone and ref["upstream_gone"]:
+                verdicts[branch] = Verdict(True, "upstream_gone", merged)
+            elif merged_into:
+                verdicts[branch] = Verdict(True, f"merged_into:{merged_into[0]}", merged)
+            elif cutoff is not None and ref["committed"] < cutoff:
+                verdicts[branch] = Verdict(True, "max_age_days", merged)
+            else:
+                verdicts[branch] = Verdict(False, None, merged)
+
+        return verdicts
+
+
+def _check_type(name, value, types, allow_none=True):
+    if value is None and allow_none:
+        return
+    # bool is an int subclass, but `max_age_days: true` is a typo, not a number
+    if isinstance(value, bool) and bool not in types or not isinstance(value, types):
+        raise ValueError(f"Invalid policy rule {name}: {value!r}")
+
+
+def _check_names(name, value):
+    if value is None:
+        return
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"Invalid policy rule {name}: expected a list of branch names")
+
+
+def compile_policy(cfg):
+    """Build a Policy from the `policy` section of the config."""
+    section = cfg.get("policy") or {}
+    if not isinstance(section, dict):
+        raise ValueError("Invalid policy section: expected a mapping of rules")
+    unknown = set(section) - POLICY_KEYS
+    if unknown:
+        raise ValueError(f"Unknown policy rules: {', '.join(sorted(unknown))}")
+
+    _check_names("protected_patterns", section.get("protected_patterns"))
+    _check_names("merged_into", section.get("merged_into"))
+    _check_type("upstream_gone", section.get("upstream_gone"), (bool,))
+    _check_type("max_age_days", section.get("max_age_days"), (int, float))
+    _check_type("min_ahead", section.get("min_ahead"), (int,))
+    for name in ("max_age_days", "min_ahead"):
+        if section.get(name) is not None and section[name] < 0:
+            raise ValueError(f"Invalid policy rule {name}: must not be negative")
+
+    patterns = section.get("protected_patterns")
+    return Policy(
+        protected_patterns=cfg["protected_branches"] if patterns is None else patterns,
+        merged_into=section.get("merged_into"),
+        upstream_gone=section.get("upstream_gone", True),
+        max_age_days=section.get("max_age_days"),
+        min_ahead=section.get("min_ahead"),
+        base_branches=cfg["protected_branches"],
+    )
@@ -0,0 +1,117 @@
+import json
+from unittest.mock import patch
+
+import requests
+
+from repo_sanitizer.ai_explainer import (
+    BATCH_SYSTEM_PROMPT,
+    EXPLAIN_NUM_CTX,
+    _batch_num_predict,
+    _batch_prompt,
+    _batch_timeout,
+    _estimate_tokens,
+    explain_branches,
+    pack_batches,
+    parse_batch_response,
+)
+
+
+def _info(name):
+    return {
+        "branch": name,
+        "last_commit_message": "wip",
+        "last_commit_date": "2024-01-01T00:00:00",
+        "commit_count": "3",
+        "merged": True,
+        "upstream_status": "gone",
+    }
+
+
+def test_pack_batches_respects_budget():
+    infos = [_info(f"feature-{i}") for i in range(50)]
+    batches = pack_batches(infos, num_ctx=1024)
+    assert len(batches) > 1
+    assert [i for b in batches for i in b] == infos
+
+
+def test_parse_batch_response_drops_invalid_entries():
+    content = json.dumps({"branches": [
+        {"branch": "a", "explanation": "- merged"},
+        {"branch": "b", "explanation": ""},
+        {"branch": "unknown", "explanation": "- x"},
+    ]})
+    assert parse_batch_response(content, ["a", "b"]) == {"a": "- merged"}
+    assert parse_batch_response("not json", ["a"]) == {}
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"message": {"content": self.content}}
+
+
+def test_pack_batches_sizes_the_prompt_that_is_sent():
+    infos = [_info(f"feature-{i}") for i in range(50)]
+    for batch in pack_batches(infos):
+        prompt_tokens = _estimate_tokens(BATCH_SYSTEM_PROMPT) + _estimate_tokens(_batch_prompt(batch))
+        output_tokens = _batch_num_predict(batch)
+        assert prompt_tokens + output_tokens <= EXPLAIN_NUM_CTX
+
+
+def test_explain_branches_falls_back_per_branch_on_bad_batch():
+    replies = [_Response("{\"branches\": [{\"branch\": \"a\""), _Response("- a"), _Response("- b")]
+    with patch("repo_sanitizer.ai_explainer.requests.post", side_effect=replies) as post:
+        result = explain_branches([_info("a"), _info("b")])
+
+    assert result == {"a": "- a", "b": "- b"}
+    assert post.call_count == 3
+
+
+def test_explain_branches_splits_batch_on_timeout():
+    half = json.dumps({"branches": [{"branch": "a", "explanation": "- a"}]})
+    other = json.dumps({"branches": [{"branch": "b", "explanation": "- b"}]})
+    replies = [requests.Timeout("slow"), _Response(half), _Response(other)]
+    with patch("repo_sanitizer.ai_explainer.requests.post", side_effect=replies) as post:
+        result = explain_branches([_info("a"), _info("b")])
+
+    assert result == {"a": "- a", "b": "- b"}
+    assert post.call_count == 3
+    batch = [_info("a"), _info("b")]
+    assert post.call_args_list[0].kwargs["timeout"] == _batch_timeout(batch)
+    assert _batch_timeout(batch) > _batch_timeout(batch[:1])
+
+
+def test_explain_branches_falls_back_per_branch_when_half_times_out():
+    other = json.dumps({"branches": [{"branch": "c", "explanation": "- c"}]})
+    # [a, b, c] times out, then half [a] times out and half [b, c] only answers c
+    replies = [requests.Timeout("slow"), requests.Timeout("slow"), _Response(other),
+               _Response("- a"), _Response("- b")]
+    with patch("repo_sanitizer.ai_explainer.requests.post", side_effect=replies) as post:
+        result = explain_branches([_info("a"), _info("b"), _info("c")])
+
+    assert result == {"a": "- a", "b": "- b", "c": "- c"}
+    assert post.call_count == 5
+
+
+def test_single_and_batched_requests_share_num_ctx():
+    batch = json.dumps({"branches": [{"branch": "a", "explanation": "- a"}]})
+    replies = [_Response(batch), _Response("- b")]
+    with patch("repo_sanitizer.ai_explainer.requests.post", side_effect=replies) as post:
+        explain_branches([_info("a"), _info("b")])
+
+    contexts = {c.kwargs["json"]["options"]["num_ctx"] for c in post.call_args_list}
+    assert contexts == {EXPLAIN_NUM_CTX}
+
+
+def test_explain_branches_reports_unreachable_ollama_once():
+    with patch("repo_sanitizer.ai_explainer.requests.post",
+               side_effect=requests.ConnectionError("refused")) as post:
+        result = explain_branches([_info("a"), _info("b")])
+
+    assert post.call_count == 1
+    assert all(r.startswith("Error calling Ollama") for r in result.values())
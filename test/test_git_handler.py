@@ -0,0 +1,102 @@
+import subprocess
+
+import pytest
+from git import GitCommandError, Repo
+
+from repo_sanitizer import analyzer, git_handler
+from repo_sanitizer.analyzer import policy_bases
+from repo_sanitizer.git_handler import get_ahead_counts, get_ref_snapshot
+from repo_sanitizer.policy import compile_policy, Verdict
+
+
+def _git(path, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=path, check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "init")
+    _git(tmp_path, "branch", "merged")
+    _git(tmp_path, "branch", "feat")
+    _git(tmp_path, "tag", "feat")  # makes %(refname:short) print heads/feat
+    _git(tmp_path, "checkout", "-q", "-b", "wip")
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "one")
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "two")
+    _git(tmp_path, "checkout", "-q", "-b", "gone", "main")
+    _git(tmp_path, "config", "branch.gone.remote", ".")
+    _git(tmp_path, "config", "branch.gone.merge", "refs/heads/missing")
+    _git(tmp_path, "checkout", "-q", "main")
+    return Repo(tmp_path)
+
+
+def test_get_ref_snapshot(repo):
+    snapshot = get_ref_snapshot(repo, ["main"], "main")
+
+    assert set(snapshot) == {"main", "merged", "feat", "wip", "gone"}
+    assert snapshot["gone"]["upstream_gone"] is True
+    assert snapshot["merged"]["upstream_gone"] is False
+    assert snapshot["feat"]["merged_into"] == ["main"]
+    assert snapshot["wip"]["merged_into"] == []
+    assert snapshot["wip"]["ahead"] == 2
+    assert snapshot["merged"]["ahead"] == 0
+
+
+def test_get_ahead_counts_falls_back_to_rev_list(repo, monkeypatch):
+    def unsupported(self, *args, **kwargs):
+        raise GitCommandError("for-each-ref", 128)
+
+    # Simulates git < 2.41, which has no %(ahead-behind) atom
+    monkeypatch.setattr(type(repo.git), "for_each_ref", unsupported, raising=False)
+
+    assert get_ahead_counts(repo, "main", ["wip", "feat"]) == {"wip": 2, "feat": 0}
+
+
+def test_policy_bases(repo):
+    cfg = {"protected_branches": ["master", "main"]}
+    assert policy_bases(repo, compile_policy(cfg)) == ["main"]
+
+    cfg["policy"] = {"merged_into": ["develop", "main"]}
+    assert policy_bases(repo, compile_policy(cfg)) == ["main"]
+
+    cfg["policy"] = {"merged_into": []}
+    assert policy_bases(repo, compile_policy(cfg)) == []
+
+
+def test_ahead_counts_skip_merged_and_unrequested_branches(repo, monkeypatch):
+    requested = []
+
+    def ahead_counts(repo, base, branches):
+        requested.extend(branches)
+        return {b: 2 for b in branches}
+
+    monkeypatch.setattr(git_handler, "get_ahead_counts", ahead_counts)
+    snapshot = get_ref_snapshot(repo, ["main"], "main", ["wip", "merged"])
+
+    assert requested == ["wip"]
+    assert snapshot["wip"]["ahead"] == 2
+    assert snapshot["merged"]["ahead"] == 0
+    assert snapshot["gone"]["ahead"] is None
+
+
+def test_min_ahead_applies_without_merged_into(repo, monkeypatch):
+    monkeypatch.setattr(analyzer, "cfg", {
+        "protected_branches": ["main"],
+        "policy": {"merged_into": [], "max_age_days": 0, "min_ahead": 1},
+    })
+    verdicts = analyzer.evaluate_branches(repo, ["wip", "merged"])
+
+    assert verdicts["wip"] == Verdict(False, "min_ahead", False)
+    assert verdicts["merged"].stale is True
+
+
+def test_min_ahead_without_base_is_an_error(repo, monkeypatch):
+    monkeypatch.setattr(analyzer, "cfg", {
+        "protected_branches": ["trunk"],
+        "policy": {"min_ahead": 1},
+    })
+    with pytest.raises(ValueError):
+        analyzer.evaluate_branches(repo, ["wip"])
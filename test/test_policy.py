@@ -0,0 +1,84 @@
+import pytest
+
+from repo_sanitizer.policy import compile_policy, Verdict
+
+NOW = 1_700_000_000
+
+
+def _ref(upstream_gone=False, age_days=0, merged_into=(), ahead=None):
+    return {
+        "upstream_gone": upstream_gone,
+        "committed": NOW - age_days * 86400,
+        "merged_into": list(merged_into),
+        "ahead": ahead,
+    }
+
+
+def test_policy_verdicts():
+    policy = compile_policy({
+        "protected_branches": ["main"],
+        "policy": {"protected_patterns": ["main", "release/*"], "max_age_days": 30, "min_ahead": 1},
+    })
+    verdicts = policy.evaluate({
+        "main": _ref(merged_into=["main"]),
+        "release/1.0": _ref(age_days=400),
+        "feature-gone": _ref(upstream_gone=True),
+        "feature-merged": _ref(merged_into=["main"], ahead=0),
+        "feature-old": _ref(age_days=60, ahead=0),
+        "feature-wip": _ref(upstream_gone=True, ahead=3),
+        "feature-new": _ref(age_days=1, ahead=0),
+    }, now=NOW)
+
+    assert verdicts["main"] == Verdict(False, "base", False)
+    assert verdicts["release/1.0"] == Verdict(False, "protected:release/*", False)
+    assert verdicts["feature-gone"] == Verdict(True, "upstream_gone", False)
+    assert verdicts["feature-merged"] == Verdict(True, "merged_into:main", True)
+    assert verdicts["feature-old"] == Verdict(True, "max_age_days", False)
+    assert verdicts["feature-wip"] == Verdict(False, "min_ahead", False)
+    assert verdicts["feature-new"] == Verdict(False, None, False)
+
+
+def test_bases_are_kept_with_custom_protected_patterns():
+    policy = compile_policy({
+        "protected_branches": ["main"],
+        "policy": {"protected_patterns": ["release/*"], "merged_into": ["main", "develop"]},
+    })
+    verdicts = policy.evaluate({
+        "main": _ref(merged_into=["main"]),
+        "develop": _ref(merged_into=["main", "develop"]),
+        "feature": _ref(merged_into=["develop"]),
+    }, now=NOW)
+
+    assert verdicts["main"] == Verdict(False, "base", False)
+    assert verdicts["develop"] == Verdict(False, "base", True)
+    assert verdicts["feature"] == Verdict(True, "merged_into:develop", True)
+
+
+def test_merged_is_reported_when_upstream_gone_matches_first():
+    policy = compile_policy({"protected_branches": ["main"]})
+    verdicts = policy.evaluate({"feature": _ref(upstream_gone=True, merged_into=["main"])}, now=NOW)
+    assert verdicts["feature"] == Verdict(True, "upstream_gone", True)
+
+
+def test_branch_is_never_stale_for_being_merged_into_itself():
+    policy = compile_policy({"protected_branches": [], "policy": {"protected_patterns": []}})
+    verdicts = policy.evaluate({"trunk": _ref(merged_into=["trunk"])}, now=NOW)
+    assert verdicts["trunk"] == Verdict(False, None, False)
+
+
+def test_empty_merged_into_disables_merged_rule():
+    policy = compile_policy({"protected_branches": ["main"], "policy": {"merged_into": []}})
+    assert policy.merged_into == []
+
+
+def test_compile_policy_rejects_invalid_rules():
+    for section in (
+        {"max_age_days": "90"},
+        {"max_age_days": True},
+        {"min_ahead": -1},
+        {"merged_into": "main"},
+        {"upstream_gone": "yes"},
+        {"max_age": 90},
+    ):
+        with pytest.raises(ValueError):
+            compile_policy({"protected_branches": ["main"], "policy": section})